@@ -1,32 +1,288 @@
 import os
 import argparse
-import configparser
+import itertools
+import json
+import random
+import re
+import sqlite3
+import string
+import sys
+import threading
 import time
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import csv
 from tqdm import tqdm
 from tabulate import tabulate
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; requests' stdlib decoder is used instead
+    orjson = None
+
+
+def _orjson_response_json(response: requests.Response, **kwargs):
+    """Decode a response body with orjson, falling back to requests' decoder."""
+    if kwargs:
+        return requests.Response.json(response, **kwargs)
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return requests.Response.json(response)
+
+
+def _orjson_response_hook(response: requests.Response, *args, **kwargs) -> requests.Response:
+    """Session response hook so spotipy's response.json() call goes through orjson."""
+    response.json = partial(_orjson_response_json, response)
+    return response
+
+
+# Only the playlist item fields written to the CSV
+_TRACK_FIELDS = (
+    "items(added_at,added_by.id,"
+    "track(id,name,duration_ms,popularity,album(name,release_date),artists(id,name))),"
+    "total"
+)
+
+# Maximum page sizes accepted by the playlist items, saved tracks and user playlists endpoints
+_PLAYLIST_PAGE_LIMIT = 100
+_SAVED_TRACKS_PAGE_LIMIT = 50
+_PLAYLISTS_PAGE_LIMIT = 50
+
+# Concurrent page requests per playlist
+_MAX_WORKERS = 8
+
+# Playlists exported at once by --all, and the cap on API requests in flight across all of them
+_MAX_PLAYLIST_WORKERS = 4
+_MAX_IN_FLIGHT = 8
+
+# Client-side pacing to stay under Spotify's rolling rate limit instead of running into 429s
+_REQUESTS_PER_SECOND = 10.0
+_REQUEST_BURST = 20
+
+# Keep-alive connections to api.spotify.com; at least _MAX_WORKERS so threads don't queue
+_HTTP_POOL_SIZE = 16
+
+# Maximum IDs per request for the audio features and artists endpoints
+_AUDIO_FEATURES_BATCH_SIZE = 100
+_ARTISTS_BATCH_SIZE = 50
+
+# On-disk cache for audio features and artist genres, which rarely change
+_METADATA_CACHE_PATH = Path.home() / '.cache' / 'exportify-cli' / 'metadata.db'
+_METADATA_CACHE_TTL = 30 * 24 * 60 * 60  # seconds
+# Stay well under SQLite's limit on parameters per statement
+_SQLITE_BATCH_SIZE = 500
+
+# Write buffer for CSV output; large playlists otherwise issue a syscall every 8 KiB
+_CSV_BUFFER_SIZE = 64 * 1024
+
+# Seconds; exponential backoff for repeated 429s, on top of any Retry-After header
+_BACKOFF_BASE = 1
+_BACKOFF_CAP = 30
+
+_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + ' _-')
+# Maps every other ASCII character to '_'
+_ASCII_FILENAME_TABLE = str.maketrans({
+    c: '_' for c in map(chr, range(128)) if c not in _FILENAME_CHARS
+})
+# \w matches exactly the characters where str.isalnum() is true, plus '_'
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w \-]')
+
+
+def _playlist_filename(name: str) -> str:
+    """Turn a playlist name into a safe, lowercase CSV filename."""
+    if name.isascii():
+        name = name.translate(_ASCII_FILENAME_TABLE)
+    else:
+        name = _UNSAFE_FILENAME_RE.sub('_', name)
+    return name.replace(' ', '_').lower() + ".csv"
+
+
+# `key = value` or `key: value`, split at the first delimiter like configparser does
+_CONFIG_OPTION_RE = re.compile(r'([^=:]+?)\s*[=:]\s*(.*)')
+
+
+def _parse_config(text: str) -> Dict[str, Dict[str, str]]:
+    """Parse the INI-style config.cfg into {section: {key: value}}."""
+    config: Dict[str, Dict[str, str]] = {}
+    section = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line[0] == '[' and line[-1] == ']':
+            section = config.setdefault(line[1:-1].strip(), {})
+        elif section is not None:
+            option = _CONFIG_OPTION_RE.match(line)
+            if option:
+                section[option[1].lower()] = option[2]
+    return config
+
+
+def _batched(items: List, size: int) -> Iterator[List]:
+    """Split a list into consecutive chunks of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _audio_feature(key: str) -> Callable:
+    """Build an extractor for one audio feature of the track."""
+    return lambda item, track, album, artists, features, genres: features.get(key) if features else None
+
+
+# CSV columns as (header, extractor) pairs; extractors take
+# (item, track, album, artists, features, genres), where album is the track's
+# album dict ({} if missing), artists its non-null artists, features its audio
+# features dict (or None) and genres its artists' joined genres. csv.writer
+# writes None as an empty cell, so extractors can return missing values as-is.
+_COLUMNS = (
+    ('Spotify ID', lambda item, track, album, artists, features, genres: track.get("id")),
+    ('Artist IDs', lambda item, track, album, artists, features, genres: ",".join(a.get("id") or "" for a in artists)),
+    ('Track Name', lambda item, track, album, artists, features, genres: track.get("name")),
+    ('Album Name', lambda item, track, album, artists, features, genres: album.get("name")),
+    ('Artist Name(s)', lambda item, track, album, artists, features, genres: ",".join(a.get("name") or "" for a in artists)),
+    ('Release Date', lambda item, track, album, artists, features, genres: album.get("release_date")),
+    ('Duration (ms)', lambda item, track, album, artists, features, genres: track.get("duration_ms")),
+    ('Popularity', lambda item, track, album, artists, features, genres: track.get("popularity")),
+    ('Added By', lambda item, track, album, artists, features, genres: (item.get("added_by") or {}).get("id")),
+    ('Added At', lambda item, track, album, artists, features, genres: item.get("added_at")),
+    ('Genres', lambda item, track, album, artists, features, genres: genres),
+    ('Danceability', _audio_feature('danceability')),
+    ('Energy', _audio_feature('energy')),
+    ('Key', _audio_feature('key')),
+    ('Loudness', _audio_feature('loudness')),
+    ('Mode', _audio_feature('mode')),
+    ('Speechiness', _audio_feature('speechiness')),
+    ('Acousticness', _audio_feature('acousticness')),
+    ('Instrumentalness', _audio_feature('instrumentalness')),
+    ('Liveness', _audio_feature('liveness')),
+    ('Valence', _audio_feature('valence')),
+    ('Tempo', _audio_feature('tempo')),
+    ('Time Signature', _audio_feature('time_signature')),
+)
+_HEADERS = tuple(header for header, _ in _COLUMNS)
+_EXTRACTORS = tuple(extractor for _, extractor in _COLUMNS)
+
+
+class _ExportStopped(Exception):
+    """Raised inside running exports once export_playlists has been interrupted."""
+
+
+class _TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions per second, in bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: threading.Event) -> bool:
+        """Block until a token is available and take it, or return False once `stop` is set."""
+        while not stop.is_set():
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self._rate
+            stop.wait(wait_time)
+        return False
+
+
+class _MetadataCache:
+    """SQLite-backed cache of JSON-serializable metadata, keyed by kind and Spotify ID."""
+
+    def __init__(self, path: Path, ttl: int = _METADATA_CACHE_TTL):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._create_table()
+        except (OSError, sqlite3.Error):
+            # Unwritable cache location; keep the cache for this run only
+            self._db = sqlite3.connect(':memory:', check_same_thread=False)
+            self._create_table()
+
+    def _create_table(self):
+        """Create the metadata table if this database doesn't have it yet."""
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "kind TEXT, id TEXT, json TEXT, fetched_at INTEGER, PRIMARY KEY (kind, id))"
+            )
+
+    def get_many(self, kind: str, ids: List[str]) -> Dict:
+        """Return the unexpired cached values for whichever of `ids` are present."""
+        cutoff = int(time.time()) - self._ttl
+        found = {}
+        with self._lock:
+            for batch in _batched(ids, _SQLITE_BATCH_SIZE):
+                rows = self._db.execute(
+                    "SELECT id, json FROM metadata WHERE kind = ? AND fetched_at >= ? "
+                    f"AND id IN ({','.join('?' * len(batch))})",
+                    (kind, cutoff, *batch)
+                )
+                found.update((id_, json.loads(data)) for id_, data in rows)
+        return found
+
+    def put_many(self, kind: str, values: Dict):
+        """Store values by ID, replacing any older entries."""
+        now = int(time.time())
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)",
+                ((kind, id_, json.dumps(value), now) for id_, value in values.items())
+            )
+
+
+# Spotify clients shared by every exporter using the same app and redirect URI,
+# each with the token bucket and in-flight cap that pace its requests
+_CLIENTS: Dict[Tuple[str, str], Tuple[spotipy.Spotify, _TokenBucket, threading.BoundedSemaphore]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
 class SpotifyExporter:
     def __init__(self, config_path: str = 'config.cfg'):
-        self.config = self._load_config(config_path)
-        self.spotify = self._init_spotify_client()
+        self.config = self._load_config(os.path.abspath(config_path))
+        self.spotify, self._bucket, self._in_flight = self._init_spotify_client()
+        self._playlists: Optional[List[Dict]] = None
+        # Per-ID metadata shared by every playlist exported in this run
+        self._audio_features: Dict[str, Optional[Dict]] = {}
+        self._artist_genres: Dict[str, List[str]] = {}
+        # None until the first audio features request shows whether this app may use them
+        self._audio_features_available: Optional[bool] = None
+        self._audio_features_lock = threading.Lock()
+        self._metadata_cache = _MetadataCache(_METADATA_CACHE_PATH)
+        # Per-thread progress bar line while exporting playlists concurrently
+        self._local = threading.local()
+        # Set when export_playlists is interrupted, so running exports stop early
+        self._stop = threading.Event()
 
-    def _load_config(self, config_path: str) -> configparser.ConfigParser:
-        """Load or create Spotify API configuration."""
-        config = configparser.ConfigParser()
-        
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _load_config(config_path: str) -> Dict[str, Dict[str, str]]:
+        """Load or create Spotify API configuration, parsed once per absolute path."""
         if not os.path.exists(config_path):
-            return self._create_config(config, config_path)
+            return SpotifyExporter._create_config(config_path)
             
-        config.read(config_path)
-        return config
+        return _parse_config(Path(config_path).read_text(encoding='utf-8'))
 
-    def _create_config(self, config: configparser.ConfigParser, config_path: str) -> configparser.ConfigParser:
+    @staticmethod
+    def _create_config(config_path: str) -> Dict[str, Dict[str, str]]:
         """Create a new configuration file with user input."""
         print("""config.cfg not found. Let's create it.
 
@@ -38,173 +294,354 @@ class SpotifyExporter:
 Now after creating the app, press the Settings button on the upper right corner.
 Copy the Client ID, Client Secret and Redirect URI and paste them below.
 """)
-        config['spotify'] = {
+        config = {'spotify': {
             'client_id': input("Client ID: "),
             'client_secret': input("Client Secret: "),
             'redirect_uri': input("Redirect URI: ")
-        }
+        }}
 
-        with open(config_path, 'w') as configfile:
-            config.write(configfile)
+        with open(config_path, 'w', encoding='utf-8') as configfile:
+            for section, values in config.items():
+                configfile.write(f"[{section}]\n")
+                configfile.writelines(f"{key} = {value}\n" for key, value in values.items())
+                configfile.write("\n")
         
         return config
 
-    def _init_spotify_client(self) -> spotipy.Spotify:
-        """Initialize Spotify client with OAuth."""
-        return spotipy.Spotify(auth_manager=SpotifyOAuth(
-            client_id=self.config.get('spotify', 'client_id'),
-            client_secret=self.config.get('spotify', 'client_secret'),
-            redirect_uri=self.config.get('spotify', 'redirect_uri'),
-            scope="playlist-read-private playlist-read-collaborative user-library-read"
-        ))
+    def _init_spotify_client(self) -> Tuple[spotipy.Spotify, _TokenBucket, threading.BoundedSemaphore]:
+        """Initialize Spotify client with OAuth, reusing an existing one and its rate limits for the same app."""
+        client_id = self.config['spotify']['client_id']
+        redirect_uri = self.config['spotify']['redirect_uri']
+
+        with _CLIENTS_LOCK:
+            shared = _CLIENTS.get((client_id, redirect_uri))
+            if shared is None:
+                client = spotipy.Spotify(auth_manager=SpotifyOAuth(
+                    client_id=client_id,
+                    client_secret=self.config['spotify']['client_secret'],
+                    redirect_uri=redirect_uri,
+                    scope="playlist-read-private playlist-read-collaborative user-library-read"
+                ))
+                # Replace spotipy's default adapter: a larger connection pool, and
+                # no urllib3-level 429 retries since _rate_limited_request handles those
+                client._session.mount('https://', HTTPAdapter(
+                    pool_connections=_HTTP_POOL_SIZE,
+                    pool_maxsize=_HTTP_POOL_SIZE,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=(500, 502, 503, 504),
+                        allowed_methods=frozenset(['GET']),
+                        raise_on_status=False,
+                    ),
+                ))
+                if orjson is not None:
+                    client._session.hooks['response'].append(_orjson_response_hook)
+                shared = _CLIENTS[(client_id, redirect_uri)] = (
+                    client,
+                    _TokenBucket(_REQUESTS_PER_SECOND, _REQUEST_BURST),
+                    threading.BoundedSemaphore(_MAX_IN_FLIGHT),
+                )
+        return shared
 
     def _rate_limited_request(self, func, *args, **kwargs):
         """Execute a rate-limited Spotify API request with automatic retry."""
+        attempt = 0
         while True:
+            if not self._bucket.acquire(self._stop):
+                raise _ExportStopped()
             try:
-                return func(*args, **kwargs)
+                with self._in_flight:
+                    return func(*args, **kwargs)
             except spotipy.SpotifyException as e:
-                if e.http_status == 429:  # Rate limit exceeded
-                    self._handle_rate_limit()
-                else:
+                if e.http_status != 429:  # Only retry when rate limited
                     raise
+                self._handle_rate_limit((e.headers or {}).get('Retry-After'), attempt)
+                attempt += 1
 
-    def _handle_rate_limit(self, wait_time: int = 60):
-        """Handle rate limiting with a countdown timer."""
-        for remaining in range(wait_time, -1, -1):
-            print(f"Rate limited. Retrying in {remaining} seconds...", end='\r')
-            time.sleep(1)
-        print()
-
-    def _safe_get(self, d: Dict, *keys) -> str:
-        """Safely get nested dictionary values."""
-        for key in keys:
-            if not isinstance(d, dict):
-                return ""
-            d = d.get(key, "")
-        return d if d is not None else ""
-
-    def _safe_join(self, items: List, key: str) -> str:
-        """Safely join list items with a specific key."""
-        if not items:
-            return ""
-        return ",".join(str(self._safe_get(item, key)) for item in items if item)
+    def _handle_rate_limit(self, retry_after: Optional[str] = None, attempt: int = 0):
+        """Wait for Spotify's Retry-After delay or a full-jitter exponential backoff, whichever is longer."""
+        delay = int(retry_after or 0)
+        backoff = random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+        # Honour Retry-After, but keep growing the wait if Spotify keeps refusing
+        wait_time = max(delay + random.uniform(0, 0.5), backoff)
+        # tqdm.write prints above any active progress bar instead of through it
+        tqdm.write(f"Rate limited. Retrying in {wait_time:.1f} seconds...")
+        self._stop.wait(wait_time)
 
     def export_playlist(self, playlist: Dict, output_dir: str):
         """Export a single playlist to CSV."""
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Create sanitized filename
-        playlist_filename = "".join(
-            c if (c.isalnum() or c in (' ', '_', '-')) else '_' 
-            for c in playlist['name']
-        ).replace(' ', '_').lower() + ".csv"
+        file_path = output_path / _playlist_filename(playlist['name'])
         
-        file_path = output_path / playlist_filename
-        
-        tracks = self._fetch_playlist_tracks(playlist)
-        self._write_tracks_to_csv(tracks, file_path, playlist['name'])
+        with closing(self._fetch_playlist_tracks(playlist)) as tracks:
+            self._write_tracks_to_csv(tracks, file_path, playlist['name'])
 
-    def _fetch_playlist_tracks(self, playlist: Dict) -> List[Dict]:
-        """Fetch all tracks from a playlist with progress bar."""
-        tracks = []
-        
-        # Initial request
-        results = (self._rate_limited_request(self.spotify.current_user_saved_tracks)
-                  if playlist['id'] == 'liked_songs'
-                  else self._rate_limited_request(self.spotify.playlist_tracks, playlist['id']))
-        
-        total_tracks = results['total']
+    def export_playlists(self, playlists: List[Dict], output_dir: str,
+                         max_workers: int = _MAX_PLAYLIST_WORKERS):
+        """Export several playlists concurrently, each worker drawing its own progress bar line."""
+        positions = itertools.count()
+
+        def assign_position():
+            self._local.bar_position = next(positions)
+
+        # Playlists whose names sanitize to the same file go to one worker, so
+        # they overwrite each other in order instead of writing concurrently
+        groups: Dict[str, List[Dict]] = {}
+        for playlist in playlists:
+            if playlist is None:  # Null entries from the API have nothing to export
+                continue
+            groups.setdefault(_playlist_filename(playlist['name']), []).append(playlist)
+        for filename, group in groups.items():
+            if len(group) > 1:
+                names = ', '.join(f"'{p['name']}'" for p in group)
+                tqdm.write(f"Warning: {names} all export to {filename}; only the last one is kept.")
+
+        def export_group(group: List[Dict]):
+            for playlist in group:
+                if self._stop.is_set():
+                    raise _ExportStopped()
+                self.export_playlist(playlist, output_dir)
+
+        self._stop.clear()
+        executor = ThreadPoolExecutor(max_workers=max_workers, initializer=assign_position)
+        try:
+            # Consuming the results re-raises the first export that failed
+            for _ in executor.map(export_group, groups.values()):
+                pass
+        except BaseException:
+            # Ctrl+C or a failed export: don't wait for the other exports to
+            # finish, but tell them to stop at their next request or page
+            self._stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+    def _fetch_playlist_tracks(self, playlist: Dict) -> Iterator[Dict]:
+        """Fetch the first page of a playlist and stream all of its tracks."""
+        if playlist['id'] == 'liked_songs':
+            limit = _SAVED_TRACKS_PAGE_LIMIT
+            fetch_page = partial(self.spotify.current_user_saved_tracks, limit=limit)
+        else:
+            limit = _PLAYLIST_PAGE_LIMIT
+            fetch_page = partial(self.spotify.playlist_items, playlist['id'],
+                                 fields=_TRACK_FIELDS, limit=limit,
+                                 additional_types=('track',))
+
+        # Initial request, which tells us how many pages are left
+        results = self._rate_limited_request(fetch_page)
         
         if len(playlist['name']) > 22:
             formatted_playlist_name = playlist['name'][:19] + '...: '
         else:
             formatted_playlist_name = (playlist['name'] + ': ').ljust(24)
-        
-        with tqdm(total=total_tracks, desc=formatted_playlist_name, unit="track",
-                  bar_format='{desc}{percentage:3.0f}%|{bar}| {n_fmt:>4}/{total_fmt:>4} [{elapsed:>6}<{remaining:>6}]'
-                  ) as pbar:
-            while True:
-                tracks.extend(results['items'])
+
+        return self._stream_pages(fetch_page, results, limit, formatted_playlist_name)
+
+    def _stream_pages(self, fetch_page: Callable, results: Dict, limit: int,
+                      desc: str) -> Iterator[Dict]:
+        """Yield items page by page, in order, while later pages are fetched concurrently."""
+        total_tracks = results['total']
+        executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+        try:
+            position = getattr(self._local, 'bar_position', None)
+            with tqdm(total=total_tracks, desc=desc, unit="track",
+                      bar_format='{desc}{percentage:3.0f}%|{bar}| {n_fmt:>4}/{total_fmt:>4} [{elapsed:>6}<{remaining:>6}]',
+                      mininterval=0.5, smoothing=0,
+                      position=position, leave=position is None) as pbar:
                 pbar.update(len(results['items']))
-                
-                if not results['next']:
-                    break
-                    
-                results = self._rate_limited_request(self.spotify.next, results)
-        
-        return tracks
-
-    def _write_tracks_to_csv(self, tracks: List[Dict], file_path: Path, playlist_name: str):
-        """Write tracks to CSV file with progress bar."""
-        headers = [
-            'Spotify ID', 'Artist IDs', 'Track Name', 'Album Name',
-            'Artist Name(s)', 'Release Date', 'Duration (ms)',
-            'Popularity', 'Added By', 'Added At', 'Genres',
-            'Danceability', 'Energy', 'Key', 'Loudness', 'Mode',
-            'Speechiness', 'Acousticness', 'Instrumentalness', 'Liveness',
-            'Valence', 'Tempo', 'Time Signature'
-        ]
-
-        with open(file_path, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(headers)
-            
-            rows = []
-            
-            for item in tracks:
-                try:
-                    track = item.get('track', {})
-                    if not track:
-                        continue
-                        
-                    artists = [a for a in track.get('artists', []) if a is not None]
-                    
-                    row = [
-                        self._safe_get(track, "id"),
-                        self._safe_join(artists, "id"),
-                        self._safe_get(track, "name"),
-                        self._safe_get(track, "album", "name"),
-                        self._safe_join(artists, "name"),
-                        self._safe_get(track, "album", "release_date"),
-                        self._safe_get(track, "duration_ms"),
-                        self._safe_get(track, "popularity"),
-                        self._safe_get(item, "added_by", "id"),
-                        self._safe_get(item, "added_at")
-                    ]
-                    
-                    rows.append(row)
-                    
-                except Exception as e:
-                    print(f"\nError processing track: {str(e)}")
-                    continue
-            writer.writerows(rows)
-
-        print(f"Exported playlist '{playlist_name}' to \"{file_path}\"\n")
-
-    def get_all_playlists(self) -> List[Dict]:
-        """Get all user playlists including Liked Songs."""
-        playlists = self._rate_limited_request(self.spotify.current_user_playlists)['items']
+
+                def page_done(future):
+                    # Runs in the worker thread, so the bar tracks pages as they
+                    # land rather than as the writer catches up with them
+                    if not future.cancelled() and future.exception() is None:
+                        pbar.update(len(future.result()['items']))
+
+                futures = deque(
+                    executor.submit(self._fetch_page, fetch_page, offset)
+                    for offset in range(limit, total_tracks, limit)
+                )
+                for future in futures:
+                    future.add_done_callback(page_done)
+
+                self._load_track_metadata(results['items'])
+                yield from results['items']
+
+                # Drop each future once its page is written, so the pages
+                # already in the CSV can be freed before the playlist ends
+                while futures:
+                    if self._stop.is_set():
+                        raise _ExportStopped()
+                    yield from futures.popleft().result()['items']
+        finally:
+            # Don't keep fetching pages nobody will read if the consumer stops early
+            executor.shutdown(cancel_futures=True)
+
+    def _fetch_page(self, fetch_page: Callable, offset: int) -> Dict:
+        """Fetch one page of items, along with the metadata its tracks need."""
+        results = self._rate_limited_request(fetch_page, offset=offset)
+        self._load_track_metadata(results['items'])
+        return results
+
+    def _load_track_metadata(self, items: List[Dict]):
+        """Batch-fetch audio features and artist genres not yet cached for a page of items."""
+        track_ids, artist_ids = [], []
+        seen_artists = set()
+        for item in items:
+            track = item.get('track')
+            if not track:
+                continue
+            track_id = track.get('id')
+            if track_id and track_id not in self._audio_features:
+                track_ids.append(track_id)
+            for artist in track.get('artists') or []:
+                artist_id = artist and artist.get('id')
+                if artist_id and artist_id not in self._artist_genres and artist_id not in seen_artists:
+                    seen_artists.add(artist_id)
+                    artist_ids.append(artist_id)
+
+        # Only ask Spotify for what an earlier run hasn't cached on disk
+        if track_ids and self._audio_features_available is not False:
+            cached = self._metadata_cache.get_many('audio_features', track_ids)
+            self._audio_features.update(cached)
+            track_ids = [track_id for track_id in track_ids if track_id not in cached]
+        if artist_ids:
+            cached = self._metadata_cache.get_many('artist_genres', artist_ids)
+            self._artist_genres.update(cached)
+            artist_ids = [artist_id for artist_id in artist_ids if artist_id not in cached]
+
+        for batch in _batched(track_ids, _AUDIO_FEATURES_BATCH_SIZE):
+            self._fetch_audio_features(batch)
+
+        for batch in _batched(artist_ids, _ARTISTS_BATCH_SIZE):
+            artists = self._rate_limited_request(self.spotify.artists, batch)['artists']
+            genres = {a['id']: a.get('genres') or [] for a in artists if a}
+            self._artist_genres.update(genres)
+            self._metadata_cache.put_many('artist_genres', genres)
+
+    def _fetch_audio_features(self, track_ids: List[str]):
+        """Fetch audio features for up to 100 tracks, once the endpoint is known to be available."""
+        if self._audio_features_available is None:
+            # Page workers load metadata concurrently. Let the first request find
+            # out whether the endpoint is available while the others wait, rather
+            # than each spending a request on the same 403.
+            with self._audio_features_lock:
+                if self._audio_features_available is None:
+                    self._audio_features_available = self._request_audio_features(track_ids)
+                    if not self._audio_features_available:
+                        tqdm.write("Audio features are not available to this Spotify app; "
+                                   "leaving those columns empty.")
+                    return
+        if self._audio_features_available:
+            self._audio_features_available = self._request_audio_features(track_ids)
+
+    def _request_audio_features(self, track_ids: List[str]) -> bool:
+        """Request and cache audio features for up to 100 tracks, returning False if Spotify refuses."""
+        try:
+            features = self._rate_limited_request(self.spotify.audio_features, track_ids)
+        except spotipy.SpotifyException as e:
+            if e.http_status != 403:
+                raise
+            # Spotify no longer grants this endpoint to newly registered apps
+            return False
+
+        # Remember tracks without features too, so they aren't requested again
+        features_by_id = dict.fromkeys(track_ids)
+        features_by_id.update((f['id'], f) for f in features or [] if f)
+        self._audio_features.update(features_by_id)
+        self._metadata_cache.put_many('audio_features', features_by_id)
+        return True
+
+    def _write_tracks_to_csv(self, tracks: Iterable[Dict], file_path: Path, playlist_name: str):
+        """Write tracks to CSV file as they arrive."""
+        # Pages stream in while the file is written, so write beside the target
+        # and only replace it once every page has arrived. A failed export then
+        # leaves the previous file intact.
+        part_path = file_path.with_name(file_path.name + '.part')
+        try:
+            with open(part_path, mode='w', newline='', encoding='utf-8',
+                      buffering=_CSV_BUFFER_SIZE) as file:
+                writer = csv.writer(file)
+                writer.writerow(_HEADERS)
+                skipped: List[Dict] = []
+                writer.writerows(self._rows(tracks, skipped))
+            os.replace(part_path, file_path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+        if skipped:
+            tqdm.write(f"Skipped {len(skipped)} item(s) in '{playlist_name}' with no track data.")
+        tqdm.write(f"Exported playlist '{playlist_name}' to \"{file_path}\"\n")
+
+    def _rows(self, tracks: Iterable[Dict], skipped: List[Dict]) -> Iterator[List]:
+        """Yield a CSV row per track, collecting items that have no track data."""
+        to_row = self._track_to_row
+        for item in tracks:
+            track = item.get('track')
+            if track:
+                yield to_row(item, track)
+            else:
+                skipped.append(item)
+
+    def _track_to_row(self, item: Dict, track: Dict) -> List:
+        """Build a CSV row from a playlist item and its track."""
+        artists = [a for a in track.get('artists') or [] if a is not None]
+        features = self._audio_features.get(track.get('id'))
+        # Genres of all the track's artists, without repeats
+        genres = ",".join(dict.fromkeys(
+            genre for artist in artists for genre in self._artist_genres.get(artist.get('id'), ())
+        ))
+        album = track.get('album') or {}
+        return [extract(item, track, album, artists, features, genres) for extract in _EXTRACTORS]
+
+    def get_all_playlists(self, force_refresh: bool = False) -> List[Dict]:
+        """Get all user playlists including Liked Songs, cached after the first call.
+
+        Liked Songs comes first, with a track total of None since counting it
+        costs an extra request.
+        """
+        if self._playlists is not None and not force_refresh:
+            return self._playlists
+
+        results = self._rate_limited_request(self.spotify.current_user_playlists,
+                                             limit=_PLAYLISTS_PAGE_LIMIT)
+        playlists = results['items']
+
+        # The first page gives the total; fetch the rest concurrently by offset
+        fetch_page = partial(self._rate_limited_request, self.spotify.current_user_playlists,
+                             limit=_PLAYLISTS_PAGE_LIMIT)
+        offsets = range(_PLAYLISTS_PAGE_LIMIT, results['total'], _PLAYLISTS_PAGE_LIMIT)
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            for page in executor.map(lambda offset: fetch_page(offset=offset), offsets):
+                playlists.extend(page['items'])
         
         # Add Liked Songs as a special playlist
         liked_songs = {
             'name': 'Liked Songs',
             'id': 'liked_songs',
             'tracks': {
-                'total': self.spotify.current_user_saved_tracks()['total']
+                'total': None
             }
         }
-        return [liked_songs] + playlists
+        self._playlists = [liked_songs] + playlists
+        return self._playlists
 
-    def list_playlists(self):
-        """Display all playlists in a formatted table."""
+    def list_playlists(self, count_liked: bool = False):
+        """Display all playlists in a formatted table, counting Liked Songs only if asked."""
         playlists = self.get_all_playlists()
-        table_data = [
-            [p['name'], p['id'], p['tracks']['total']]
+        liked_total = '?'
+        if count_liked:
+            liked_total = self._rate_limited_request(
+                self.spotify.current_user_saved_tracks, limit=1)['total']
+
+        table_data = (
+            (p['name'], p['id'], liked_total if p['id'] == 'liked_songs' else p['tracks']['total'])
             for p in playlists if p is not None
-        ]
-        print(tabulate(table_data, headers=["Name", "ID", "Tracks"], tablefmt="simple"))
+        )
+        sys.stdout.write(tabulate(table_data, headers=["Name", "ID", "Tracks"], tablefmt="simple") + "\n")
 
 def main():
     parser = argparse.ArgumentParser(description="Export Spotify playlists to CSV.")
@@ -212,30 +649,30 @@ def main():
     parser.add_argument('-p', '--playlists', nargs='+', help="Specify playlist names or IDs to export")
     parser.add_argument('-o', '--output', default='./playlists/', help="Specify the output directory (default: ./playlists/)")
     parser.add_argument('-l', '--list', action='store_true', help="List all playlists")
+    parser.add_argument('--count-liked', action='store_true', help="Also count Liked Songs when listing")
 
     args = parser.parse_args()
     
     exporter = SpotifyExporter()
     
-    # Initialize Spotify connection
-    exporter.spotify.current_user()
-    
     if args.list:
-        exporter.list_playlists()
+        exporter.list_playlists(count_liked=args.count_liked)
         return
         
     if args.all:
-        for playlist in exporter.get_all_playlists():
-            exporter.export_playlist(playlist, args.output)
+        exporter.export_playlists(exporter.get_all_playlists(), args.output)
         return
             
     if args.playlists:
-        playlists = exporter.get_all_playlists()
+        # Index by name and ID once; the first playlist with a given key wins
+        playlists_by_key = {}
+        for p in exporter.get_all_playlists():
+            if p:
+                playlists_by_key.setdefault(p['name'], p)
+                playlists_by_key.setdefault(p['id'], p)
+
         for name_or_id in args.playlists:
-            playlist = next(
-                (p for p in playlists if p and (p['name'] == name_or_id or p['id'] == name_or_id)),
-                None
-            )
+            playlist = playlists_by_key.get(name_or_id)
             
             if playlist:
                 exporter.export_playlist(playlist, args.output)